@@ -1,9 +1,20 @@
 import json
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
 import pygame
 
 
+class _FlippedFrames(dict):
+
+    def __init__(self, frames: dict):
+        super().__init__()
+        self._frames = frames
+
+    def __missing__(self, key) -> pygame.Surface:
+        frame = self[key] = pygame.transform.flip(self._frames[key], True, False)
+        return frame
+
+
 class SpriteSheet:
 
     IMAGE_EXTENSION = "png"
@@ -13,23 +24,32 @@ class SpriteSheet:
 
         self._image: Optional[pygame.Surface] = None
         self._data = dict()
-        self._frames = {True: {}, False: {}}
+        frames = {}
+        self._frames = {False: frames, True: _FlippedFrames(frames)}
         self._scale = scale
 
         image_path = f"{filename}.{SpriteSheet.IMAGE_EXTENSION}"
         meta_path = f"{filename}.{SpriteSheet.DATA_EXTENSION}"
 
         self._image = pygame.image.load(image_path).convert_alpha()
+        if self._scale != 1:
+            width, height = self._image.get_size()
+            self._image = pygame.transform.scale(self._image, (width * self._scale, height * self._scale))
 
         with open(meta_path, 'r') as F:
             self._data = json.load(F)
 
+        self._cut()
+
+    def _cut(self):
+        frames = self._frames[False]
         for name, index in self._data["frames"].items():
-            frame = pygame.Surface(index[2:], pygame.SRCALPHA, 32).convert_alpha()
-            frame.blit(self._image, (0, 0), index)
-            frame = pygame.transform.scale(frame, (index[2] * self._scale, index[3] * self._scale))
-            self._frames[False][name] = frame
-            self._frames[True][name] = pygame.transform.flip(frame, True, False)
+            frames[name] = self._image.subsurface([value * self._scale for value in index])
+        self._frames[True].clear()
+
+    def rebind_to_display(self):
+        self._image = self._image.convert_alpha(pygame.display.get_surface())
+        self._cut()
 
     def size(self, key: str) -> (int, int):
         return self._data["frames"][key][2:]
@@ -37,6 +57,10 @@ class SpriteSheet:
     def get(self, key, flipped: bool = False) -> pygame.Surface:
         return self._frames[flipped][key]
 
+    def blits(self, display: pygame.Surface, items: Iterable[Tuple[str, Tuple, bool]]):
+        get = self.get
+        display.blits([(get(key, flipped), pos) for key, pos, flipped in items], doreturn=False)
+
 
 class Scene:
 
@@ -4,7 +4,7 @@ import pygame
 
 from engine.tools import Singleton
 
-pygame.mixer.init()
+pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=512)
 
 
 class Sound(pygame.mixer.Sound):
@@ -17,11 +17,21 @@ class Sound(pygame.mixer.Sound):
 class Audio(metaclass=Singleton):
 
     def __init__(self, sound_data: dict):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
         self.enabled = False
-        self._sounds = {name: Sound(filename) for name, filename in sound_data.items()}
+        self._sound_data = sound_data
+        self._sounds = {}
+
+    def sound(self, key) -> Sound:
+        if key not in self._sounds:
+            self._sounds[key] = Sound(self._sound_data[key])
+        return self._sounds[key]
 
     def play(self, key):
-        pass
+        if self.enabled:
+            self.sound(key).play()
 
     def set_volume(self, value, sounds: Tuple[str]):
         pass
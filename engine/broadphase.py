@@ -0,0 +1,112 @@
+from array import array
+from bisect import insort
+from math import ceil, floor
+from operator import attrgetter
+from typing import Iterable
+
+import pygame
+
+from engine.physics import CollisionList, StaticBody
+
+
+LEFT = attrgetter("body.left")
+
+
+class SpatialGrid(CollisionList):
+
+    def __init__(self, bodies: Iterable = (), cell: int = 64):
+        super().__init__()
+        self._cell = cell
+        self._cells = {}
+        self._keys = {}
+        for body in bodies:
+            self.add(body)
+
+    def cells(self, rect: pygame.Rect) -> list:
+        cell = self._cell
+        x0, y0 = rect.left // cell, rect.top // cell
+        x1, y1 = max(rect.right - 1, rect.left) // cell, max(rect.bottom - 1, rect.top) // cell
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    def add(self, body: StaticBody):
+        super().add(body)
+        keys = self._keys[body] = self.cells(body.body)
+        for key in keys:
+            self._cells.setdefault(key, []).append(body.body)
+
+    def remove(self, body: StaticBody):
+        super().remove(body)
+        for key in self._keys.pop(body):
+            rects = self._cells[key]
+            del rects[next(index for index, rect in enumerate(rects) if rect is body.body)]
+            if not rects:
+                del self._cells[key]
+
+    def update(self, body: StaticBody):
+        self.remove(body)
+        self.add(body)
+
+    def hits(self, rect: pygame.Rect) -> list:
+        cells = self._cells
+        candidates = list({id(other): other for key in self.cells(rect) for other in cells.get(key, ())}.values())
+        return [candidates[index] for index in rect.collidelistall(candidates)]
+
+
+class SweepAndPrune:
+
+    def __init__(self, bodies: Iterable = (), margin: int = 0):
+        self._bodies = sorted(bodies, key=LEFT)
+        self._overlaps = {}
+        self._margin = margin
+
+    def __iter__(self):
+        return iter(self._bodies)
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def add(self, body: StaticBody):
+        insort(self._bodies, body, key=LEFT)
+
+    def remove(self, body: StaticBody):
+        self._bodies.remove(body)
+        self._overlaps.pop(body, None)
+
+    def overlaps(self, body: StaticBody) -> list:
+        return self._overlaps.get(body, [])
+
+    def swept(self, body: StaticBody, dt: float) -> tuple:
+        rect, margin = body.body, self._margin
+        vel = getattr(body, "vel", None)
+        dx, dy = (vel.x * dt, vel.y * dt) if vel is not None else (0, 0)
+        return (
+            floor(rect.left + min(dx, 0)) - margin, ceil(rect.right + max(dx, 0)) + margin,
+            floor(rect.top + min(dy, 0)) - margin, ceil(rect.bottom + max(dy, 0)) + margin,
+        )
+
+    def update(self, dt: float = 0.0):
+        bodies = self._bodies
+        boxes = [self.swept(body, dt) for body in bodies]        # current rect ∪ rect after this step
+        for index in range(1, len(bodies)):
+            body, box = bodies[index], boxes[index]
+            position = index - 1
+            while position >= 0 and boxes[position][0] > box[0]:
+                bodies[position + 1], boxes[position + 1] = bodies[position], boxes[position]
+                position -= 1
+            bodies[position + 1], boxes[position + 1] = body, box
+
+        lefts = array("i", [box[0] for box in boxes])
+        rights = array("i", [box[1] for box in boxes])
+        tops = array("i", [box[2] for box in boxes])
+        bottoms = array("i", [box[3] for box in boxes])
+        overlaps = [[] for _ in bodies]
+        active = []
+        for index, left in enumerate(lefts):
+            top, bottom = tops[index], bottoms[index]
+            active = [other for other in active if rights[other] >= left]   # touching bodies are candidates too
+            for other in active:
+                if tops[other] <= bottom and top <= bottoms[other]:
+                    overlaps[index].append(bodies[other])
+                    overlaps[other].append(bodies[index])
+            active.append(index)
+        self._overlaps = dict(zip(bodies, overlaps))
@@ -8,12 +8,21 @@ from engine.tools import Window, Singleton
 
 class Engine(ABC, metaclass=Singleton):
 
-    def __init__(self, fps, scale: int = 1, display_flags: int = pygame.FULLSCREEN):
-
-        self.display = pygame.display.set_mode((Window.WIDTH // scale, Window.HEIGHT // scale), display_flags, vsync=1)
+    def __init__(
+            self,
+            fps,
+            scale: int = 1,
+            display_flags: int = pygame.FULLSCREEN | pygame.SCALED | pygame.DOUBLEBUF,
+            event_rate: float = 240,
+    ):
+
+        size = (Window.WIDTH // scale, Window.HEIGHT // scale)
+        self.display = pygame.display.set_mode(size, display_flags, depth=32, vsync=1)
         self.clock = Clock()
         self._running = False
         self._fps = fps
+        self._event_rate = event_rate
+        self.pumping = True
 
     def start(self):
         if not self._running:
@@ -36,8 +45,15 @@ class Engine(ABC, metaclass=Singleton):
         pass
 
     def loop(self):
+        clock, fps = self.clock, self._fps
+        tick, events, logic, render = clock.tick, self.events, self.logic, self.render
+        period = 1000 / self._event_rate if self._event_rate else 0
+        pumped = -period
         while self._running:
-            self.clock.tick(self._fps)
-            self.events()
-            self.logic()
-            self.render()
+            tick(fps)
+            self.pumping = clock.now - pumped >= period
+            if self.pumping:
+                pumped = clock.now
+            events()
+            logic()
+            render()
@@ -9,14 +9,14 @@ from engine.tools import Singleton
 
 
 class Key:
+    __slots__ = ("_key", "_press", "_hold", "_repeat", "_period", "_next")
 
-    def __init__(self, key: int, repeat: (int, int), clock: Clock):
+    def __init__(self, key: int, repeat: (int, int)):
         self._key = key
         self._press = False
         self._hold = False
-        self._state_mark = 0
-        self._repeat = repeat[0]
-        self._signal = clock.timer(repeat[1], periodic=True)
+        self._repeat, self._period = repeat
+        self._next = 0
 
     def __getitem__(self, mode: str) -> bool:
         if mode == 'press':
@@ -25,65 +25,74 @@ class Key:
             return self._hold
 
     def update(self, hold: tuple, now: int):
-        if hold[self._key] - self._hold == 1:
+        held = hold[self._key]
+        if held and not self._hold:
             self._press = True
-            self._state_mark = now
-        elif hold[self._key]:
-            if now - self._repeat > self._state_mark:
-                self._press = self._signal.query()
-            else:
-                self._press = False
+            self._next = now + self._repeat
+        elif held and now >= self._next:
+            self._press = True
+            self._next = now + self._period
         else:
             self._press = False
 
-        self._hold = hold[self._key]
+        self._hold = held
 
 
 class Mouse(metaclass=Singleton):
+    __slots__ = ("_buttons", "_pressed", "frame", "_drag", "_wheel", "pos", "last_pos", "cursor")
+
+    BUTTONS = 5
 
     def __init__(self):
-        self._click = [False, False, False, False, False]
-        self._release = [False, False, False, False, False]
-        self._hold = [False, False, False, False, False]
-        self._temp = self._click[:]
+        self._buttons = {"press": 0, "hold": 0, "release": 0}
+        self._pressed = (False,) * Mouse.BUTTONS
+        self.frame = -1
         self._drag = [Vector(0, 0), Vector(0, 0)]
         self._wheel = 0
 
         self.pos = Vector(pygame.mouse.get_pos())
-        self.last_pos = Vector(pygame.mouse.get_pos())
+        self.last_pos = Vector(self.pos)
+        self.cursor = pygame.Rect(self.pos, (1, 1))
 
     def __getitem__(self, button_mode: (int, str)) -> Union[bool, int]:
         if button_mode == "scroll":
             return self._wheel
-        else:
-            button, mode = button_mode
-            if mode == "press":
-                return self._click[button]
-            elif mode == "hold":
-                return self._hold[button]
-            elif mode == "release":
-                return self._release[button]
-
-    def update(self, events: list):
+        button, mode = button_mode
+        return bool(self._buttons.get(mode, 0) >> button & 1)
+
+    def update(self, events: list, frame: int = 0):
+        self.frame = frame
         self._wheel = 0
         for event in events:
             if event.type == pygame.MOUSEWHEEL:
-                self._wheel = event.y
+                self._wheel += event.y
 
+        self.last_pos = self.pos
         self.pos = Vector(pygame.mouse.get_pos())
-        self._hold = pygame.mouse.get_pressed(num_buttons=5)
+        self.cursor.topleft = self.pos
+        self._pressed = pygame.mouse.get_pressed(num_buttons=Mouse.BUTTONS)
+        hold = sum(pressed << button for button, pressed in enumerate(self._pressed))
+        last = self._buttons["hold"]
 
-        if not self._hold[0]:
-            self._drag[0] = Vector(self.pos)
-        self._drag[1] = self._drag[0] - Vector(self.pos)
+        if not hold & 1:
+            self._drag[0] = self.pos
+        self._drag[1] = self._drag[0] - self.pos
 
-        self._click = [current - last == 1 for current, last in zip(self._hold, self._temp)]
-        self._release = [current - last == -1 for current, last in zip(self._hold, self._temp)]
-        self._temp = self._hold[:]
+        self._buttons["press"] = hold & ~last
+        self._buttons["release"] = last & ~hold
+        self._buttons["hold"] = hold
 
     def focused(self, rect: pygame.Rect):
         return rect.collidepoint(*self.pos)
 
+    @property
+    def hold(self) -> tuple:
+        return self._pressed
+
+    @property
+    def idle(self) -> bool:
+        return not (self._buttons["press"] | self._buttons["hold"] | self._buttons["release"])
+
     @property
     def drag(self) -> Vector:
         return Vector(self._drag[1])
@@ -91,6 +100,10 @@ class Mouse(metaclass=Singleton):
 
 class EventHandler(metaclass=Singleton):
 
+    EVENT_TYPES = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEWHEEL)
+    QUEUED_TYPES = EVENT_TYPES + (pygame.TEXTINPUT,)  # KEYDOWN takes its unicode from TEXTINPUT
+    SPECIAL_KEYS = {pygame.K_BACKSPACE: "BACKSPACE", pygame.K_RETURN: "RETURN", pygame.K_ESCAPE: "ESCAPE"}
+
     def __init__(self, clock: Clock, key_config: JsonFile):
         self.clock = clock
         self.mouse: Mouse = Mouse()
@@ -101,37 +114,45 @@ class EventHandler(metaclass=Singleton):
         self.keys = self._generate_keys(keys, delays)
         self.events = None
         self.now = 0
+        self.frame = 0
+        self._text = ""
+        self._exit = False
 
     def _generate_keys(self, keys: dict, delays: dict) -> dict:
-        return {key: Key(keys[key], delay, self.clock) for key, delay in delays.items()}
+        return {key: Key(keys[key], delay) for key, delay in delays.items()}
 
-    def update(self):
-        self.events = pygame.event.get()
+    def update(self, events: list = None):
+        if events is None:
+            events = pygame.event.get()
+        types = EventHandler.EVENT_TYPES
+        self.events = [event for event in events if event.type in types]
         hold = pygame.key.get_pressed()
         self.now = self.clock.now
-        self.mouse.update(self.events)
+        self.frame += 1
+        self.mouse.update(self.events, self.frame)
 
         for key in self.keys.values():
             key.update(hold, self.now)
 
-    def text_input(self) -> str:
+        self._text = ""
         for event in self.events:
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_BACKSPACE:
-                    return "BACKSPACE"
-                elif event.key == pygame.K_RETURN:
-                    return "RETURN"
-                elif event.key == pygame.K_ESCAPE:
-                    return "ESCAPE"
-                else:
-                    return event.unicode
-        return ""
+                self._text = EventHandler.SPECIAL_KEYS.get(event.key, event.unicode)
+                break
+
+        self._exit = any(event.type == pygame.QUIT for event in self.events)
+
+    def text_input(self) -> str:
+        return self._text
+
+    def exit_requested(self) -> bool:
+        return self._exit
 
     def __getitem__(self, key_mode: (int, str)) -> Union[bool, str]:
         if key_mode == "exit":
-            return any(event.type == pygame.QUIT for event in self.events)
+            return self._exit
         if key_mode == "type":
-            return self.text_input()
-        else:
-            key, mode = key_mode
-            return self.keys[key][mode]
+            return self._text
+        name, mode = key_mode
+        key = self.keys.get(name)
+        return False if key is None else key[mode]
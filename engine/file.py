@@ -1,8 +1,11 @@
 import json
+import re
 from configparser import ConfigParser
 
 from abc import ABC, abstractmethod
-from typing import Any
+from operator import add, mul, neg, pos, sub, truediv
+from types import MappingProxyType
+from typing import Any, Callable
 
 
 class File(ABC):
@@ -65,38 +68,168 @@ class JsonFile(File):
         return self._data
 
 
+class Expression:
+    _TOKEN = re.compile(r"\s*([+\-*/()]|\d+\.?\d*|[A-Za-z_][A-Za-z_0-9]*)")
+    _SUM = {"+": add, "-": sub}
+    _PRODUCT = {"*": mul, "/": truediv}
+    _UNARY = {"+": pos, "-": neg}
+
+    def __init__(self, source: str):
+        self._source = source
+        self._tokens = self._tokenize(source)
+        self._index = 0
+        self._function = self._sum()
+        if self._index != len(self._tokens):
+            self._error()
+        del self._tokens
+
+    def __call__(self, resolve: Callable[[str], Any]) -> Any:
+        return self._function(resolve)
+
+    def _error(self):
+        raise ValueError(f"Invalid expression: {self._source!r}")
+
+    def _tokenize(self, source: str) -> list:
+        tokens, index, end = [], 0, len(source.rstrip())
+        while index < end:
+            match = self._TOKEN.match(source, index)
+            if match is None:
+                self._error()
+            tokens.append(match.group(1))
+            index = match.end()
+        return tokens
+
+    def _next(self) -> str:
+        return self._tokens[self._index] if self._index < len(self._tokens) else ""
+
+    def _sum(self) -> Callable:
+        function = self._product()
+        while self._next() in self._SUM:
+            operator = self._SUM[self._tokens[self._index]]
+            self._index += 1
+            function = self._binary(operator, function, self._product())
+        return function
+
+    def _product(self) -> Callable:
+        function = self._unary()
+        while self._next() in self._PRODUCT:
+            operator = self._PRODUCT[self._tokens[self._index]]
+            self._index += 1
+            function = self._binary(operator, function, self._unary())
+        return function
+
+    def _unary(self) -> Callable:
+        token = self._next()
+        if token in self._UNARY:
+            self._index += 1
+            operator, operand = self._UNARY[token], self._unary()
+            return lambda resolve: operator(operand(resolve))
+        return self._atom()
+
+    def _atom(self) -> Callable:
+        token = self._next()
+        self._index += 1
+        if token == "(":
+            function = self._sum()
+            if self._next() != ")":
+                self._error()
+            self._index += 1
+            return function
+        elif token[:1].isdigit():
+            value = float(token) if "." in token else int(token)
+            return lambda resolve: value
+        elif token[:1].isalpha() or token[:1] == "_":
+            return lambda resolve: resolve(token)
+        self._error()
+
+    @staticmethod
+    def _binary(operator: Callable, left: Callable, right: Callable) -> Callable:
+        return lambda resolve: operator(left(resolve), right(resolve))
+
+
 class DynamicJsonFile(JsonFile):
 
     def __init__(self, path: str):
+        self._expressions = {}
+        self._strings = {}
+        self._substituted = None
         super().__init__(path, read_only=False)
 
+    def __setattr__(self, name: str, value: Any):
+        if name == "_data":
+            self._invalidate()
+        super().__setattr__(name, value)
+
+    def _invalidate(self):
+        self._substituted = None
+        self._strings.clear()
+
+    def _save(self):
+        super()._save()
+        self._invalidate()
+
     @property
-    def data(self) -> dict:
-        return self._substitute_values(self._data)
+    def data(self) -> MappingProxyType:
+        if self._substituted is None:
+            self._substituted = self._freeze(self._substitute_values(self._data))
+        return self._substituted
 
-    def _substitute_values(self, data: dict) -> Any:
+    @staticmethod
+    def _freeze(data: Any) -> Any:
         if isinstance(data, dict):
-            return {key: self._substitute_values(value) for key, value in data.items()}
+            return MappingProxyType({key: DynamicJsonFile._freeze(value) for key, value in data.items()})
         elif isinstance(data, list):
-            return [self._substitute_values(element) for element in data]
-        elif isinstance(data, str):
-            if data in self._data.keys():
-                return self._data[data]
+            return tuple(DynamicJsonFile._freeze(element) for element in data)
+        else:
+            return data
+
+    def _substitute_values(self, data: dict) -> Any:
+        root = [data]
+        stack = [(root, 0, data)]
+        while stack:
+            container, index, value = stack.pop()
+            if isinstance(value, dict):
+                result = container[index] = dict.fromkeys(value)
+                stack.extend((result, key, element) for key, element in value.items())
+            elif isinstance(value, list):
+                result = container[index] = [None] * len(value)
+                stack.extend((result, key, element) for key, element in enumerate(value))
             else:
-                for key in self._data.keys():
-                    data = data.replace(key, str(self._data[key]))
+                container[index] = self._substitute(value)
+        return root[0]
+
+    def _substitute(self, data: Any) -> Any:
+        if isinstance(data, str):
+            if data not in self._strings:
+                self._strings[data] = self._substitute_string(data)
+            return self._strings[data]
+        else:
+            return data
 
-                if any(char in data for char in "+-*/"):
-                    return eval(data)
-                else:
-                    return data
+    def _substitute_string(self, data: str) -> Any:
+        if data in self._data.keys():
+            return self._data[data]
+        elif any(char in data for char in "+-*/"):
+            return self._evaluate(data)
         else:
+            for key in self._data.keys():
+                data = data.replace(key, str(self._data[key]))
             return data
 
+    def _evaluate(self, expression: str) -> Any:
+        if expression not in self._expressions:
+            self._expressions[expression] = Expression(expression)
+        return self._expressions[expression](self._resolve)
+
+    def _resolve(self, name: str) -> Any:
+        return self._substitute(self._data[name])
+
 
 class IniFile(File):
     _EXTENSION = "ini"
     _FLOATING_POINT_CHARACTER = '.'
+    _NUMBER = re.compile(r"-?\d+(\.\d+)?")
+    _BOOLEAN = {"true": True, "True": True, "TRUE": True, "false": False, "False": False, "FALSE": False}
 
     def __init__(self, path: str = None, read_only: bool = True):
         self._config = ConfigParser()
@@ -110,10 +243,10 @@ class IniFile(File):
 
         for section in self._data.values():
             for name, value in section.items():
-                if value.replace(IniFile._FLOATING_POINT_CHARACTER, '').isnumeric():
-                    value = float(value) if '.' in value else int(value)
-                elif value.lower() in ("true", "false"):
-                    value = value == "true"
+                if value in IniFile._BOOLEAN:
+                    value = IniFile._BOOLEAN[value]
+                elif IniFile._NUMBER.fullmatch(value):
+                    value = float(value) if IniFile._FLOATING_POINT_CHARACTER in value else int(value)
                 setattr(self, name.upper(), value)
 
     def _save(self) -> None:
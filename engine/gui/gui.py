@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
 from enum import Enum
+from itertools import islice, repeat
 from math import floor
+from operator import attrgetter
 from typing import Optional, Union, Tuple, List, Iterator, Any
 
 import pygame
@@ -13,28 +16,26 @@ from engine.tools import Vector
 RectangleArrayType = Union[Tuple, List]
 CoordinateArrayType = Union[Vector, Tuple, List]
 
+LAYER = attrgetter("layer")
+
 
 class WidgetSettingsIterator:
 
     def __init__(self, *args, **kwargs):
-        self._index: int = 0
-        longest = max([*kwargs.values(), args], key=lambda value: len(value) if hasattr(value, "__iter__") else 0)
-        self._length = len(longest)
-
-        self._args = tuple(arg if self.iterable(arg) else (arg,) * self._length for arg in args)
-        self._kwargs = {name: kw if self.iterable(kw) else (kw,) * self._length for name, kw in kwargs.items()}
+        self._length = len(args)
+        for value in kwargs.values():
+            if self.iterable(value) and len(value) > self._length:
+                self._length = len(value)
 
-    def __iter__(self) -> Iterator:
-        self._index = -1
-        return self
+        self._args = tuple(arg if self.iterable(arg) else repeat(arg) for arg in args)
+        self._keys = tuple(kwargs)
+        self._kwargs = tuple(kw if self.iterable(kw) else repeat(kw) for kw in kwargs.values())
 
-    def __next__(self) -> Tuple[tuple, dict]:
-        self._index += 1
-        if self._index >= self._length:
-            raise StopIteration
-        args = tuple(value[self._index] for value in self._args)
-        kwargs = {key: value[self._index] for key, value in self._kwargs.items()}
-        return *args, kwargs
+    def __iter__(self) -> Iterator[tuple]:
+        count = len(self._args)
+        keys = self._keys
+        for row in islice(zip(*self._args, *self._kwargs), self._length):
+            yield *row[:count], dict(zip(keys, row[count:]))
 
     @staticmethod
     def iterable(obj):
@@ -46,6 +47,7 @@ class WidgetStyleDescriptor:
 
 
 class Register:
+    __slots__ = ("value",)
 
     def __init__(self, value: Any = None):
         self.value: Any = value
@@ -59,25 +61,45 @@ class Register:
     def __str__(self) -> str: return str(self.value)
 
 
+class _FontCache(dict):
+
+    def __init__(self, bold: bool):
+        super().__init__()
+        self._bold = bold
+
+    def __missing__(self, size: int) -> pygame.font.Font:
+        font = self[size] = pygame.font.SysFont("monospace", size, bold=self._bold)
+        return font
+
+
 class Gui(metaclass=Singleton):
 
     pygame.font.init()
     FONT_SIZES = (12, 14, 16, 18, 20, 22, 24, 26, 28, 30, 32)
-    FONT = {
-        False: {size: pygame.font.SysFont("monospace", size, bold=False) for size in FONT_SIZES},
-        True: {size: pygame.font.SysFont("monospace", size, bold=True) for size in FONT_SIZES},
-    }
+    FONT_SIZE_BOUNDS = tuple((lower + upper) / 2 for lower, upper in zip(FONT_SIZES, FONT_SIZES[1:]))
+    FONT = {False: _FontCache(False), True: _FontCache(True)}
 
     def __init__(self, text_size: int = 20):
-        self._text_size = text_size
+        self._text_size = None
+        self.text_size = text_size
         self._all_groups = set()
         self._active_groups = set()
         self._focused = set()
+        self._focused_groups = set()
+        self._widget_groups = dict()
         self._registers = dict()
+        self._layered_groups = None
+        self._layered_focus = None
+        self._rendered_order = -1
+        self.order = 0
 
     @property
-    def text_size(self):
-        return min(Gui.FONT_SIZES, key=lambda element: abs(element - self._text_size))
+    def text_size(self) -> int:
+        return self._text_size
+
+    @text_size.setter
+    def text_size(self, size: int):
+        self._text_size = Gui.FONT_SIZES[bisect_left(Gui.FONT_SIZE_BOUNDS, size)]
 
     def register(self, name: str = None, value: Any = None):
         if name is None:
@@ -88,50 +110,98 @@ class Gui(metaclass=Singleton):
             self._registers[name].value = value
         return self._registers[name]
 
+    @property
+    def layered_groups(self) -> list:
+        if self._layered_groups is None:
+            self._layered_groups = sorted(self._active_groups, key=LAYER, reverse=True)
+        return self._layered_groups
+
+    @property
+    def layered_focus(self) -> list:
+        if self._layered_focus is None:
+            self._layered_focus = sorted(self._focused, key=LAYER, reverse=True)
+        return self._layered_focus
+
+    def invalidate_order(self):
+        self.order += 1
+        self._layered_groups = None
+        self._layered_focus = None
+
     def add_group(self, *groups: "WidgetGroup"):
         self._all_groups.update(groups)
+        self.invalidate_order()
+
+    def add_widget(self, widget: "Widget", group: "WidgetGroup"):
+        self._widget_groups.setdefault(widget, set()).add(group)
+
+    def groups_of(self, widget: "Widget") -> set:
+        return self._widget_groups.get(widget, set())
 
     def is_active(self, item: Union["Widget", "WidgetGroup"]):
         if isinstance(item, WidgetGroup):
             return item in self._active_groups
         else:
-            return any(item in group for group in self._active_groups)
+            return not self._active_groups.isdisjoint(self._widget_groups.get(item, ()))
 
     def is_focused(self, item: Union["Widget", "WidgetGroup"] = None):
         if item is None:
             return bool(self._focused)
         elif isinstance(item, WidgetGroup):
-            return item in self._focused or any(widget in self._focused for widget in item)
+            return item in self._focused or item in self._focused_groups
         else:
             return item in self._focused
 
     def activate_group(self, *groups: "WidgetGroup"):
         self._active_groups |= set(groups)
+        self.invalidate_order()
 
     def deactivate_group(self, *groups: "WidgetGroup"):
         self._active_groups -= set(groups)
+        self.invalidate_order()
 
     def focus_widget(self, item: Union["Widget", "WidgetGroup"], overwrite: bool = False):
         if (not self._focused or overwrite) and self.is_active(item):
             self._focused = {item}
+            self._focused_groups = self._widget_groups.get(item, set())
+            self.invalidate_order()
 
     def release_widget(self, item: Union["Widget", "WidgetGroup"], event_handler: EventHandler = None):
         if item in self._focused:
             self._focused.remove(item)
+            self._focused_groups = set().union(*(self._widget_groups.get(focused, ()) for focused in self._focused))
+            self.invalidate_order()
             if event_handler is not None:
                 self.events(event_handler)
 
     def events(self, event_handler: EventHandler):
-        active = self._focused if self._focused else self._active_groups
-        for group in sorted(active, key=lambda g: g.layer, reverse=True):
+        for group in self.layered_focus if self._focused else self.layered_groups:
             group.events(event_handler)
 
-    def render(self, display: pygame.Surface):
-        for group in sorted(self._active_groups, key=lambda g: g.layer, reverse=True):
-            group.render(display)
+    def render(self, display: pygame.Surface) -> Optional[List[pygame.Rect]]:
+        dirty = []
+        for group in self.layered_groups:
+            dirty.extend(group.render(display))
+        if self._rendered_order != self.order:
+            self._rendered_order = self.order
+            return None
+        return dirty
+
+    def pending(self) -> Optional[List[pygame.Rect]]:
+        if self._rendered_order != self.order:
+            return None
+        return [area for group in self.layered_groups for area in group.pending()]
+
+    def tick(self, event_handler: EventHandler, display: pygame.Surface) -> Optional[List[pygame.Rect]]:
+        self.events(event_handler)
+        return self.render(display)
 
 
 class Widget(Hashable, pygame.Rect, ABC):
+    __slots__ = (
+        "id", "_gui", "_layer", "_base", "_anchor", "_align", "_placement", "_snapped_size",
+        "hovered", "entered", "leaved", "pressed", "pressed_elsewhere", "last_hovered",
+        "_rendered_state", "_rendered_rect", "_hit",
+    )
 
     def __init__(
             self,
@@ -149,6 +219,8 @@ class Widget(Hashable, pygame.Rect, ABC):
         self._base = Vector(0, 0)
         self._anchor = Vector(0, 0)
         self._align = None
+        self._placement = None
+        self._snapped_size = None
 
         self.snap(dim[:2], anchor, align)
 
@@ -158,6 +230,10 @@ class Widget(Hashable, pygame.Rect, ABC):
         self.pressed = False
         self.pressed_elsewhere = False
         self.last_hovered = False
+        self._hit = None
+
+        self._rendered_state = None
+        self._rendered_rect = pygame.Rect(self)
 
         if group is not None:
             self._gui = group.gui
@@ -166,25 +242,86 @@ class Widget(Hashable, pygame.Rect, ABC):
     def snap(self, pos: CoordinateArrayType = None, anchor: CoordinateArrayType = None, align: str = None):
         if pos is not None:
             self._base = Vector(pos)
+            self._placement = None
         if anchor is not None:
             self._anchor = Vector(anchor)
+            self._placement = None
         if align is not None:
             self._align = align
+            self._placement = None
 
-        setattr(self, self._align, self._base + self._anchor)
+        if self._placement is None:
+            self._placement = self._base + self._anchor
+        elif self._snapped_size == self.size:
+            return
+
+        Align.SETTERS[self._align](self, self._placement)
+        self._snapped_size = self.size
+
+    def shift(self, dx: int, dy: int):
+        self.move_ip(dx, dy)
+        self._anchor += (dx, dy)
+        if self._placement is not None:
+            self._placement += (dx, dy)
 
     def events(self, event_handler: EventHandler):
-        self.hovered = event_handler.mouse.focused(self)
-        self.entered = self.hovered and not self.last_hovered
-        self.leaved = self.last_hovered and not self.hovered
-        self.pressed = self.hovered and event_handler.mouse[0, "press"]
-        self.pressed_elsewhere = not self.hovered and event_handler.mouse[0, "press"]
-        self.last_hovered = self.hovered
+        mouse = event_handler.mouse
+        click = mouse[0, "press"]
+        hovered = self.collidepoint(mouse.pos) if self._hit is None else self._hit
+        last_hovered = self.last_hovered
+        self._hit = None
+
+        self.hovered = hovered
+        self.entered = hovered and not last_hovered
+        self.leaved = last_hovered and not hovered
+        self.pressed = hovered and click
+        self.pressed_elsewhere = not hovered and click
+        self.last_hovered = hovered
+
+    def reset_hover(self):
+        self.hovered = False
+        self.entered = False
+        self.leaved = False
+        self.pressed = False
+        self.pressed_elsewhere = False
+        self.last_hovered = False
 
     @property
     def layer(self) -> int:
         return self._layer
 
+    @layer.setter
+    def layer(self, layer: int):
+        self._layer = layer
+        for group in self._gui.groups_of(self):
+            group.reposition(self)
+
+    @property
+    def bounds(self) -> pygame.Rect:
+        return self
+
+    def layout(self):
+        pass
+
+    def render_state(self) -> tuple:
+        return self.x, self.y, self.w, self.h, self._layer, self.hovered
+
+    def pending(self) -> Optional[pygame.Rect]:
+        self.layout()
+        if self.render_state() == self._rendered_state:
+            return None
+        return self._rendered_rect.union(self.bounds)
+
+    def rendered(self) -> Optional[pygame.Rect]:
+        state = self.render_state()
+        if state == self._rendered_state:
+            return None
+        bounds = self.bounds
+        area = self._rendered_rect.union(bounds)
+        self._rendered_state = state
+        self._rendered_rect = pygame.Rect(bounds)
+        return area
+
     @abstractmethod
     def render(self, display: pygame.Surface) -> None:
         pass
@@ -200,7 +337,9 @@ class WidgetGroup(Hashable):
     ):
         Hashable.__init__(self)
         self._gui = gui
-        self._widgets = set()
+        self._widgets = []
+        self._renderers = None
+        self._order = -1
         self._layer = layer
 
         gui.add_group(self)
@@ -208,26 +347,66 @@ class WidgetGroup(Hashable):
             gui.activate_group(self)
 
     def __iter__(self) -> Widget:
-        yield from sorted(self._widgets, key=lambda widget: widget.layer, reverse=True)
+        if self._order != self._gui.order:
+            self._widgets.sort(key=LAYER)
+            self._renderers = None
+            self._order = self._gui.order
+        return reversed(self._widgets)
 
     @property
     def layer(self):
         return self._layer
 
+    @layer.setter
+    def layer(self, layer: int):
+        self._layer = layer
+        self._gui.invalidate_order()
+
     @property
     def gui(self):
         return self._gui
 
     def add_widget(self, widget: Widget):
-        self._widgets.add(widget)
+        insort(self._widgets, widget, key=LAYER)
+        self._renderers = None
+        self._gui.add_widget(widget, self)
 
-    def events(self, event_handler: EventHandler):
+    def reposition(self, widget: Widget):
+        self._widgets.remove(widget)
+        insort(self._widgets, widget, key=LAYER)
+        self._renderers = None
+
+    def pending(self) -> List[pygame.Rect]:
+        areas = []
         for widget in self:
+            area = widget.pending()
+            if isinstance(area, list):  # carriers report a list of their own
+                areas.extend(area)
+            elif area is not None:
+                areas.append(area)
+        return areas
+
+    def events(self, event_handler: EventHandler):
+        widgets = list(self)
+        hits = frozenset(event_handler.mouse.cursor.collidelistall(widgets))
+        for index, widget in enumerate(widgets):
+            widget._hit = index in hits
             widget.events(event_handler)
 
-    def render(self, display: pygame.Surface):
-        for widget in self:
-            widget.render(display)
+    def render(self, display: pygame.Surface) -> List[pygame.Rect]:
+        widgets = iter(self)
+        if self._renderers is None:
+            self._renderers = [(widget, widget.render, widget.rendered) for widget in widgets]
+
+        dirty = []
+        clip = display.get_clip()
+        for widget, render, rendered in self._renderers:
+            if widget.bounds.colliderect(clip):
+                render(display)
+            area = rendered()
+            if area is not None:
+                dirty.append(area)
+        return dirty
 
 
 class WidgetCarrier(WidgetGroup, Widget):
@@ -243,11 +422,67 @@ class WidgetCarrier(WidgetGroup, Widget):
         Widget.__init__(self, None, dim)
         WidgetGroup.__init__(self, gui, active=active, layer=layer)
         self._color = color
+        self._surface: Optional[pygame.Surface] = None
+        self._surface_rect = pygame.Rect(self)
 
     def add_widget(self, widget: Widget):
         widget.snap(anchor=self.topleft)
         super().add_widget(widget)
-
-    def render(self, display: pygame.Surface):
-        pygame.draw.rect(display, self._color, self)
-        super().render(display)
\ No newline at end of file
+        self._surface = None
+
+    def shift(self, dx: int, dy: int):
+        Widget.shift(self, dx, dy)
+        for widget in self._widgets:
+            widget.shift(dx, dy)
+
+    def area(self) -> pygame.Rect:
+        return pygame.Rect(self.bounds).unionall([widget.bounds for widget in self._widgets])
+
+    def compose(self) -> pygame.Rect:
+        area = self.area()
+        self._draw_offscreen(area)
+        resized = self.area()
+        if resized != area:
+            area = resized
+            self._draw_offscreen(area)
+
+        for widget in self._widgets:
+            widget.rendered()
+        self.rendered()
+
+        dirty = self._surface_rect.union(area)
+        self._surface_rect = area
+        return dirty
+
+    def _draw_offscreen(self, area: pygame.Rect):
+        if self._surface is None or self._surface.get_size() != area.size:
+            self._surface = pygame.Surface(area.size, pygame.SRCALPHA)
+        else:
+            self._surface.fill((0, 0, 0, 0))
+        x, y = area.topleft
+        self.shift(-x, -y)
+        self.draw(self._surface)
+        self.shift(x, y)
+
+    def stale(self) -> bool:
+        if self._surface is None or self.render_state() != self._rendered_state:
+            return True
+        return any(widget.render_state() != widget._rendered_state for widget in self._widgets)
+
+    def pending(self) -> List[pygame.Rect]:
+        for widget in self._widgets:
+            widget.layout()
+        return [self._surface_rect.union(self.area())] if self.stale() else []
+
+    def draw(self, surface: pygame.Surface):
+        surface.fill(self._color, self)
+        for widget in self:
+            widget.render(surface)
+
+    def render(self, display: pygame.Surface) -> List[pygame.Rect]:
+        clip = display.get_clip()
+        if self._surface is not None and not self._surface_rect.colliderect(clip) and not self.bounds.colliderect(clip):
+            return []
+        dirty = [self.compose()] if self.stale() else []
+        display.blit(self._surface, self._surface_rect)
+        return dirty
@@ -1,3 +1,5 @@
+from functools import lru_cache
+from math import isfinite
 from typing import Tuple, Union
 
 import pygame
@@ -8,7 +10,34 @@ from engine.gui.gui import Gui, Register, Widget, WidgetGroup, CoordinateArrayTy
 from engine.events import EventHandler
 
 
+@lru_cache(maxsize=512)
+def _text_surface(text: str, color: Tuple, bold: bool, size: int) -> pygame.Surface:
+    return Gui.FONT[bold][size].render(text, True, color)
+
+
+def _freeze_color(color):
+    if isinstance(color, (int, float)):
+        return color
+    return tuple(_freeze_color(channel) for channel in color)
+
+
+class _KeepCharacters(dict):
+
+    def __init__(self, characters: str):
+        super().__init__((ord(char), char) for char in characters)
+
+    def __missing__(self, code: int) -> None:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _text_dim(text: str, bold: bool, size: int) -> Tuple[int, int]:
+    return Gui.FONT[bold][size].size(text)
+
+
 class TextWidget(Widget):
+    __slots__ = ("_text_register", "_color", "_text_size", "_bold", "_font", "_text_rect", "_label_size")
+
     def __init__(
             self,
             group: WidgetGroup,
@@ -22,8 +51,10 @@ class TextWidget(Widget):
         super().__init__(group, (*pos, 0, 0), **kwargs)
         self._text_register = Register(text)
         self.color = color
-        self.text_size = self._gui.text_size if text_size is None else text_size
-        self.bold = bold
+        self._text_size = self._gui.text_size if text_size is None else text_size
+        self._bold = bold
+        self._font = Gui.FONT[self._bold][self._text_size]
+        self._text_rect = pygame.Rect(0, 0, 0, 0)
         self.update_dim(text)
 
     def render_text(
@@ -37,29 +68,74 @@ class TextWidget(Widget):
         if align is None:
             align = self._align
         if pos is None:
-            pos = getattr(self, self._align)
+            pos = Align.GETTERS[self._align](self)
 
-        surface = self.font.render(text, True, color)
-        rect = surface.get_rect()
+        surface = _text_surface(text, color, self._bold, self._text_size)
+        rect = self._text_rect
+        rect.size = surface.get_size()
 
-        setattr(rect, align, pos)
+        Align.SETTERS[align](rect, pos)
         display.blit(surface, rect)
         return rect.width, rect.height
 
     def update_dim(self, text: str):
-        width, height = self.font.size(text)
-        self.update(self.left, self.top, width, height)
-        self.snap()
+        self._label_size = self.measure(text)
+        self.resize(*self._label_size)
+
+    def resize(self, width: int, height: int):
+        if (width, height) != self.size:
+            self.update(self.left, self.top, width, height)
+            self.snap()
+
+    def midleft_offset(self, dx: float) -> Tuple[float, int]:
+        return self.left + dx, self.centery
+
+    def measure(self, text: str) -> Tuple[int, int]:
+        return _text_dim(text, self._bold, self._text_size)
+
+    def invalidate(self):
+        self._font = Gui.FONT[self._bold][self._text_size]
+        self._label_size = self.measure(self.text)
+
+    def render_state(self) -> tuple:
+        return super().render_state() + (self.text, self._color, self._text_size, self._bold)
 
     @property
     def font(self) -> pygame.font.Font:
-        return self._gui.FONT[self.bold][self.text_size]
+        return self._font
+
+    @property
+    def color(self) -> Tuple:
+        return self._color
+
+    @color.setter
+    def color(self, color: Tuple):
+        self._color = _freeze_color(color)
+
+    @property
+    def text_size(self) -> int:
+        return self._text_size
+
+    @text_size.setter
+    def text_size(self, size: int):
+        self._text_size = size
+        self.invalidate()
+
+    @property
+    def bold(self) -> bool:
+        return self._bold
+
+    @bold.setter
+    def bold(self, bold: bool):
+        self._bold = bold
+        self.invalidate()
 
     @property
     def text(self): return str(self._text_register.value)
 
 
 class TextLabel(TextWidget):
+    __slots__ = ()
 
     def __init__(
             self,
@@ -80,6 +156,7 @@ class TextLabel(TextWidget):
 
 
 class DataLabel(TextWidget):
+    __slots__ = ("_value_register", "_decimals")
 
     def __init__(
             self,
@@ -96,14 +173,18 @@ class DataLabel(TextWidget):
         self._value_register = self._gui.register(register, value)
         self._decimals = decimals
 
+    def layout(self):
+        w1, h1 = self._label_size
+        w2, h2 = self.measure(str(self._value_register))
+        self.resize(w1 + w2, max(h1, h2))
+
     def render(self, display: pygame.Surface):
-        w1, h1 = self.font.size(self.text)
-        w2, h2 = self.font.size(str(self._value_register))
-        self.update(self.left, self.top, w1 + w2, max(h1, h2))
-        self.snap()
+        self.layout()
+        self.render_text(display, self.text, self.color[0], self.midleft_offset(0), Align.ML)
+        self.render_text(display, str(self._value_register), self.color[1], self.midleft_offset(self._label_size[0]), Align.ML)
 
-        self.render_text(display, self.text, self.color[0], self.midleft + Vector(w1 / 2, 0), Align.C)
-        self.render_text(display, str(self._value_register), self.color[1], self.midleft + Vector(w1 + w2 / 2, 0), Align.C)
+    def render_state(self) -> tuple:
+        return super().render_state() + (self._value_register.value,)
 
     @property
     def value(self) -> float:
@@ -116,12 +197,15 @@ class DataLabel(TextWidget):
 
 
 class Button(TextLabel):
+    __slots__ = ()
 
     def render(self, display: pygame.Surface):
         self.render_text(display, self.text, self.color[self.hovered])
 
 
 class Slider(Widget):
+    __slots__ = ("hold", "moved", "_value_register", "_rail", "_slider", "_color", "_initial_value")
+
     SIZE = 20
     RAIL = 5
 
@@ -149,21 +233,34 @@ class Slider(Widget):
 
     def events(self, event_handler: EventHandler):
         super().events(event_handler)
+        mouse = event_handler.mouse
 
         if self.hovered:
-            if event_handler.mouse[0, "press"]:
+            if self.pressed:
                 self.hold = True
-            elif event_handler.mouse[2, "press"]:
+            elif mouse[2, "press"]:
                 self.value = self._initial_value
-            elif scroll := event_handler.mouse["scroll"]:
+            elif scroll := mouse["scroll"]:
                 self.value = self.value + scroll * 0.005
-        if not event_handler.mouse[0, "hold"]:
+        if not mouse[0, "hold"]:
             self.hold = False
 
+    def shift(self, dx: int, dy: int):
+        super().shift(dx, dy)
+        self._rail.move_ip(dx, dy)
+        self._slider.move_ip(dx, dy)
+
     def render(self, display: pygame.Surface):
         color = self._color[self.hovered or self.hold]
-        pygame.draw.rect(display, color[1], self._rail)
-        pygame.draw.rect(display, color[0], self._slider)
+        display.fill(color[1], self._rail)
+        display.fill(color[0], self._slider)
+
+    @property
+    def bounds(self) -> pygame.Rect:
+        return self._slider.union(self)
+
+    def render_state(self) -> tuple:
+        return super().render_state() + (self.hold, self._slider.x, self._slider.y)
 
     @staticmethod
     def dim(pos, length) -> RectangleArrayType:
@@ -177,11 +274,13 @@ class Slider(Widget):
 
 
 class HorizontalSlider(Slider):
+    __slots__ = ("_span",)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._rail = pygame.Rect(self.left, int((self.height - Slider.RAIL) / 2) + self.top, self.width, Slider.RAIL)
         self._slider = pygame.Rect(self.left, self.top, Slider.SIZE, Slider.SIZE)
+        self._span = self.width
         self.value = self._initial_value
 
     @staticmethod
@@ -190,29 +289,36 @@ class HorizontalSlider(Slider):
 
     def events(self, event_handler: EventHandler):
         super().events(event_handler)
+        span = self._span
 
-        slide = min(max(event_handler.mouse.pos.x - self.left, 0), self.width)
+        slide = event_handler.mouse.pos.x - self.left
+        slide = 0 if slide < 0 else span if slide > span else slide
         if slide != self._value_register.value and self.hold:
             self._value_register.value = slide
             self.moved = True
 
-        self._slider.left = min(max(self._value_register.value, 0), self.width) + self.left - self.height / 2
+        value = self._value_register.value
+        self._slider.left = (0 if value < 0 else span if value > span else value) + self.left - self.height / 2
 
     @property
     def value(self) -> float:
-        return self._value_register.value / self.width
+        return self._value_register.value / self._span
 
     @value.setter
     def value(self, val: float):
-        self._value_register.value = min(max(val * self.width, 0), self.width)
+        span = self._span
+        val = val * span
+        self._value_register.value = 0 if val < 0 else span if val > span else val
 
 
 class VerticalSlider(Slider):
+    __slots__ = ("_span",)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._rail = pygame.Rect(int((self.width - Slider.RAIL) / 2) + self.left, self.top, Slider.RAIL, self.height)
         self._slider = pygame.Rect(self.left, self.top, Slider.SIZE, Slider.SIZE)
+        self._span = self.height
         self.value = self._initial_value
 
     @staticmethod
@@ -221,23 +327,29 @@ class VerticalSlider(Slider):
 
     def events(self, event_handler: EventHandler):
         super().events(event_handler)
+        span = self._span
 
-        slide = min(max(event_handler.mouse.pos.y - self.top, 0), self.height)
+        slide = event_handler.mouse.pos.y - self.top
+        slide = 0 if slide < 0 else span if slide > span else slide
         if slide != self._value_register.value and self.hold:
             self._value_register.value = slide
             self.moved = True
-        self._slider.top = min(max(self._value_register.value, 0), self.height) + self.top - self.width / 2
+        value = self._value_register.value
+        self._slider.top = (0 if value < 0 else span if value > span else value) + self.top - self.width / 2
 
     @property
     def value(self) -> float:
-        return self._value_register.value / self.height
+        return self._value_register.value / self._span
 
     @value.setter
     def value(self, val: float):
-        self._value_register.value = min(max(val * self.height, 0), self.height)
+        span = self._span
+        val = val * span
+        self._value_register.value = 0 if val < 0 else span if val > span else val
 
 
 class Switch(TextWidget):
+    __slots__ = ("_switch_register", "last_active", "activated", "deactivated")
 
     def __init__(
             self,
@@ -266,11 +378,16 @@ class Switch(TextWidget):
         self.deactivated = self.last_active and not self.active
         self.last_active = self.active
 
+    def render_state(self) -> tuple:
+        return super().render_state() + (self.active,)
+
     @property
     def active(self) -> bool: return self._switch_register.value
 
 
 class FlipSwitch(Switch):
+    __slots__ = ()
+
     STATE_TEXT = ("OFF", "ON")
 
     def events(self, event_handler: EventHandler):
@@ -278,19 +395,20 @@ class FlipSwitch(Switch):
         if self.pressed:
             self.relay()
 
+    def layout(self):
+        w1, h1 = self._label_size
+        w2, h2 = self.measure(FlipSwitch.STATE_TEXT[self.active])
+        self.resize(w1 + w2, max(h1, h2))
+
     def render(self, display: pygame.Surface):
+        self.layout()
         color = self.color[self.hovered]
-        w1, h1 = self.font.size(self.text)
-        w2, h2 = self.font.size(FlipSwitch.STATE_TEXT[self.active])
-        self.update(self.left, self.top, w1 + w2, max(h1, h2))
-        self.snap()
-
-        self.render_text(display, self.text, color[0], self.midleft + Vector(w1 / 2, 0), Align.C)
-        self.render_text(display, FlipSwitch.STATE_TEXT[self.active], color[1],
-                         self.midleft + self.midleft + Vector(w1 + w2 / 2, 0), Align.C)
+        self.render_text(display, self.text, color[0], self.midleft_offset(0), Align.ML)
+        self.render_text(display, FlipSwitch.STATE_TEXT[self.active], color[1], self.midleft_offset(self._label_size[0]), Align.ML)
 
 
 class TextInput(Switch):
+    __slots__ = ("_value_register", "_visible_value", "_minimum_content_width")
 
     def __init__(
             self,
@@ -306,16 +424,15 @@ class TextInput(Switch):
 
         self._value_register = self._gui.register(register, value)
         self._visible_value = self._value_register.value
-        self._minimum_content_width = self.font.size(str(self._visible_value))[0] + self.font.size(self.text)[0]
+        self._minimum_content_width = self.measure(str(self._visible_value))[0] + self._label_size[0]
 
     def events(self, event_handler: EventHandler):
         super().events(event_handler)
 
-        if event_handler.mouse[0, "press"]:
-            if self.hovered and not self.active:
-                self.activate()
-            else:
-                self.deactivate()
+        if self.pressed and not self.active:
+            self.activate()
+        elif self.pressed or self.pressed_elsewhere:
+            self.deactivate()
 
         if self.active:
             key = event_handler["type"]
@@ -354,20 +471,29 @@ class TextInput(Switch):
         self._value_register.value = str(new_value)
         self._visible_value = self._value_register.value
 
+    @property
+    def shown_value(self) -> str:
+        return str(self._visible_value if self.active else self._value_register.value)
+
+    def layout(self):
+        w1, h1 = self._label_size
+        w2, h2 = self.measure(self.shown_value)
+        self.resize(max(w1 + w2, self._minimum_content_width), max(h1, h2))
+
     def render(self, display: pygame.Surface):
+        self.layout()
         color = self.color[self.hovered or self.active]
-        value = self._visible_value if self.active else self._value_register.value
-        w1, h1 = self.font.size(self.text)
-        w2, h2 = self.font.size(str(value))
-        self.update(self.left, self.top, max(w1 + w2, self._minimum_content_width), max(h1, h2))
-        self.snap()
+        self.render_text(display, self.text, color[0], self.midleft_offset(0), Align.ML)
+        self.render_text(display, self.shown_value, color[1], self.midleft_offset(self._label_size[0]), Align.ML)
 
-        self.render_text(display, self.text, color[0], self.midleft + Vector(w1 / 2, 0), Align.C)
-        self.render_text(display, str(value), color[1], self.midleft + Vector(w1 + w2 / 2, 0), Align.C)
+    def render_state(self) -> tuple:
+        return super().render_state() + (self._visible_value, self._value_register.value)
 
 
 class NumericInput(TextInput):
-    NUMERIC = (".", "-", "+")
+    __slots__ = ("_limits", "_increment", "_decimals")
+
+    NUMERIC = _KeepCharacters("0123456789.-+")
 
     def __init__(
             self,
@@ -393,22 +519,25 @@ class NumericInput(TextInput):
             self.value = self.value + event_handler.mouse["scroll"] * self._increment
 
     @staticmethod
-    def is_numeric(value: str) -> bool:
-        value = str(value)
-        if value.startswith("-") or value.startswith("+"):
-            value = value[1:]
-        return value.replace(".", "").isnumeric()
-
-    def format(self, value: str) -> float:
-        if self._limits[0] is not None:
-            value = max(self._limits[0], float(value))
-        if self._limits[1] is not None:
-            value = min(self._limits[1], float(value))
-        return round(float(value), self._decimals)
+    def is_numeric(value: Union[float, int, str]) -> bool:
+        if isinstance(value, (int, float)):
+            return isfinite(value)
+        try:
+            return isfinite(float(value))
+        except (ValueError, TypeError):
+            return False
+
+    def format(self, value: Union[float, int, str]) -> float:
+        value = float(value)
+        lower, upper = self._limits
+        if lower is not None and value < lower:
+            value = float(lower)
+        if upper is not None and value > upper:
+            value = float(upper)
+        return round(value, self._decimals)
 
     def type(self, char: str):
-        if char.isnumeric() or char in NumericInput.NUMERIC:
-            super().type(char)
+        super().type(char.translate(NumericInput.NUMERIC))
 
     @property
     def value(self) -> float:
@@ -418,12 +547,13 @@ class NumericInput(TextInput):
     def value(self, new_value: Union[float, int, str]):
         if new_value == "":
             self._value_register.value = 0.0
-        if self.is_numeric(new_value):
+        elif self.is_numeric(new_value):
             self._value_register.value = self.format(new_value)
         self._visible_value = self._value_register.value
 
 
 class Dropdown(Switch):
+    __slots__ = ("_items", "_names", "_order", "_hovered_index", "_length", "_tiles")
 
     def __init__(
             self,
@@ -437,17 +567,24 @@ class Dropdown(Switch):
     ):
         super().__init__(group, pos, color, f"{text}: ", active=False, **kwargs)
         self._items = items
-        self._order = items
+        self._names = list(items.names())
+        self._order = self._names
         self.select(initial)
         self._hovered_index = 0
         self._length = len(items)
+        self._tiles = {}
 
     @property
     def layer(self) -> int:
         return -1 if self.active else self._layer
 
     def select(self, selected: Enum):
-        self._order = sorted(self._items.names(), key=lambda item: int(item != selected))
+        names = self._names
+        for index, name in enumerate(names):
+            if name == selected:
+                self._order = [name, *names[:index], *names[index + 1:]]
+                return
+        self._order = list(names)
 
     @property
     def selected(self) -> Enum:
@@ -456,8 +593,8 @@ class Dropdown(Switch):
     def step(self, direction: int = 0):
         self._hovered_index += direction
         if self._hovered_index < 0:
-            self._hovered_index = len(self._items) - 1
-        if self._hovered_index >= len(self._items):
+            self._hovered_index = self._length - 1
+        if self._hovered_index >= self._length:
             self._hovered_index = 0
 
     def events(self, event_handler: EventHandler):
@@ -471,14 +608,15 @@ class Dropdown(Switch):
             else:
                 self.active = True
 
+        mouse = event_handler.mouse
         if self.hovered:
             if self.active:
-                pos = event_handler.mouse.pos.y - self.top
+                pos = mouse.pos.y - self.top
                 self._hovered_index = floor(pos * self._length / self.height) if self.active else 0
             else:
-                if step := event_handler.mouse["scroll"]:
+                if step := mouse["scroll"]:
                     self.step(step)
-                    self.select(self._items.names()[self._hovered_index])
+                    self.select(self._names[self._hovered_index])
         else:
             self.active = False
 
@@ -487,31 +625,42 @@ class Dropdown(Switch):
         if self.deactivated:
             self._gui.release_widget(self)
 
-    def render(self, display: pygame.Surface):
+    def layout(self):
+        items = self._order if self.active else self._order[:1]
+        stretch = max((self.measure(item)[0] for item in items), default=0)
+        self.resize(self._label_size[0] + stretch, (self._text_size + 5) * len(items))
 
+    def render(self, display: pygame.Surface):
+        self.layout()
         color = self.color[self.hovered or self.active][0]
         width, _ = self.render_text(display, self.text, color, align=Align.TL)
-        height = 0
-        stretch = 0
 
         if self.active:
             x, y, w, h = self
-            tw, _ = self.font.size(self.text)
-            pygame.draw.rect(display, self.color[0], (x + tw, y, w - tw, h))
+            tw, _ = self._label_size
+            display.fill(self.color[0], (x + tw, y, w - tw, h))
 
+        tiles = self._tiles
+        left = self.left + width
+        top = self.top
+        step = self._text_size + 5
         for index, item in enumerate(self._order):
             glow = index == self._hovered_index and self.active or not self.active and self.hovered
             color = self.color[glow][1]
-            pos = self.topleft + Vector(width, (self.text_size + 5) * index)
-            w, _ = self.render_text(display, item, color, pos, Align.TL)
-            height = height + self.text_size + 5
-            stretch = max(stretch, w)
+            tile = tiles.get((item, color))
+            if tile is None:
+                tile = tiles[item, color] = _text_surface(item, color, self._bold, self._text_size)
+            display.blit(tile, (left, top + step * index))
 
             if not self.active:
                 break
 
-        self.update(self.left, self.top, width + stretch, height)
-        self.snap()
+    def invalidate(self):
+        super().invalidate()
+        self._tiles = {}
+
+    def render_state(self) -> tuple:
+        return super().render_state() + (self._hovered_index, tuple(self._order))
 
 
 class FloatingWindow(WidgetCarrier):
@@ -544,26 +693,46 @@ class FloatingWindow(WidgetCarrier):
         self.header_holded = False
         self.close_hovered = False
         self.close_pressed = False
+        self._idle = False
 
     @property
     def layer(self):
         return -1 if self._gui.is_focused(self) else self._layer
 
     def float(self, vector: Vector):
-        self.topleft = self._base - vector
-        self._header.bottomleft = self.topleft
-        self._close.topright = self._header.topright + Vector(-FloatingWindow.GAP, FloatingWindow.GAP)
+        left, top = self.topleft
+        self.topleft = (self._base.x - vector.x, self._base.y - vector.y)
+        dx, dy = self.left - left, self.top - top
+        if not dx and not dy:
+            return
+
+        self._header.move_ip(dx, dy)
+        self._close.move_ip(dx, dy)
         for widget in self._widgets:
-            widget.snap(anchor=self.topleft)
+            widget.shift(dx, dy)
 
     def events(self, event_handler: EventHandler):
+        mouse = event_handler.mouse
+        pos = mouse.pos
+
+        if mouse.idle and not (self.collidepoint(pos) or self._header.collidepoint(pos) or self._gui.is_focused(self)):
+            if not self._idle:
+                for widget in self._widgets:
+                    widget.reset_hover()
+                self.reset_hover()
+                self.close_hovered = self.close_pressed = False
+                self.header_hovered = self.header_pressed = False
+                self._idle = True
+            return
+        self._idle = False
+
         WidgetGroup.events(self, event_handler)
         Widget.events(self, event_handler)
 
-        mouseclick = event_handler.mouse[0, "press"]
+        mouseclick = mouse[0, "press"]
 
-        self.close_hovered = event_handler.mouse.focused(self._close)
-        self.header_hovered = event_handler.mouse.focused(self._header)
+        self.close_hovered = self._close.collidepoint(pos)
+        self.header_hovered = self._header.collidepoint(pos)
 
         self.close_pressed = self.close_hovered and mouseclick
         self.header_pressed = self.header_hovered and mouseclick
@@ -577,11 +746,11 @@ class FloatingWindow(WidgetCarrier):
 
         if self.header_pressed:
             self.header_holded = True
-        if not event_handler.mouse[0, "hold"]:
+        if not mouse[0, "hold"]:
             self.header_holded = False
 
         if self.header_holded:
-            self.float(event_handler.mouse.drag)
+            self.float(mouse.drag)
         else:
             self.snap(self.topleft)
 
@@ -590,11 +759,25 @@ class FloatingWindow(WidgetCarrier):
         if self.pressed_elsewhere:
             self._gui.release_widget(self, event_handler)
 
-    def render(self, display: pygame.Surface):
+    def shift(self, dx: int, dy: int):
+        super().shift(dx, dy)
+        self._header.move_ip(dx, dy)
+        self._close.move_ip(dx, dy)
+
+    def draw(self, surface: pygame.Surface):
         gap = FloatingWindow.GAP
         rect = pygame.Rect(self.left + gap, self.top, self.width - gap * 2, self.height - gap)
-        pygame.draw.rect(display, self._color[1][self._gui.is_focused(self)], self)
-        pygame.draw.rect(display, self._color[0], rect)
-        pygame.draw.rect(display, self._color[1][self._gui.is_focused(self)], self._header)
-        pygame.draw.rect(display, self._color[3][self.close_hovered], self._close)
-        WidgetGroup.render(self, display)
\ No newline at end of file
+        frame = self._color[1][self._gui.is_focused(self)]
+        surface.fill(frame, self)
+        surface.fill(self._color[0], rect)
+        surface.fill(frame, self._header)
+        surface.fill(self._color[3][self.close_hovered], self._close)
+        for widget in self:
+            widget.render(surface)
+
+    @property
+    def bounds(self) -> pygame.Rect:
+        return self._header.union(self)
+
+    def render_state(self) -> tuple:
+        return super().render_state() + (self._gui.is_focused(self), self.close_hovered)
\ No newline at end of file
@@ -1,9 +1,43 @@
+from typing import Iterable
+
 import pygame
 
 from engine.gui import CoordinateArrayType
 from engine.tools import Vector
 
 
+class Side:
+    LEFT: int = 1
+    RIGHT: int = 2
+    TOP: int = 4
+    BOTTOM: int = 8
+
+
+class CollisionList:
+
+    def __init__(self, bodies: Iterable = ()):
+        self.bodies = list(bodies)
+        self.rects = [body.body for body in self.bodies]
+
+    def __iter__(self):
+        return iter(self.bodies)
+
+    def __len__(self) -> int:
+        return len(self.bodies)
+
+    def add(self, body: "StaticBody"):
+        self.bodies.append(body)
+        self.rects.append(body.body)
+
+    def remove(self, body: "StaticBody"):
+        index = self.bodies.index(body)
+        del self.bodies[index]
+        del self.rects[index]
+
+    def hits(self, rect: pygame.Rect) -> list:
+        return [self.rects[index] for index in rect.collidelistall(self.rects)]
+
+
 class CollisionRect(pygame.Rect):
 
     def __init__(self, owner, dim: CoordinateArrayType, pos=None):
@@ -13,77 +47,114 @@ class CollisionRect(pygame.Rect):
             self.center = pos
             self.ground_counter = 0
 
-    def collide_x(self, collision_list: tuple = None):
+    def collide_x(self, collision_list: CollisionList = None) -> int:
         self.centerx = self.owner.pos.x
-        collided = [False, False]
-
         if collision_list is None:
-            return collided
-
-        for body in collision_list:
-            if self.colliderect(body.body):
-                if self.owner.vel.x > 0:
-                    collided[1] = True
-                    self.right = body.body.left
-                elif self.owner.vel.x < 0:
-                    collided[0] = True
-                    body.left = body.body.right
-                self.owner.vel.x = 0
-                self.owner.pos.x = body.centerx
-        return collided
+            return self.resolve_x(())
+        if not isinstance(collision_list, CollisionList):
+            collision_list = CollisionList(collision_list)
+        return self.resolve_x(collision_list.hits(self))
 
-    def collide_y(self, collision_list: tuple = None):
+    def collide_y(self, collision_list: CollisionList = None) -> int:
         self.centery = self.owner.pos.y
-        collided = [False, False]
-
         if collision_list is None:
-            return collided
+            return self.resolve_y(())
+        if not isinstance(collision_list, CollisionList):
+            collision_list = CollisionList(collision_list)
+        return self.resolve_y(collision_list.hits(self))
+
+    def resolve_x(self, rects: Iterable[pygame.Rect]) -> int:
+        pos, vel = self.owner.pos, self.owner.vel
+        self.centerx = pos.x
+        collided = 0
+
+        left, right, top, bottom = self.left, self.right, self.top, self.bottom
+        for rect in rects:
+            if rect.left < right and left < rect.right and rect.top < bottom and top < rect.bottom:
+                if vel.x > 0:
+                    collided |= Side.RIGHT
+                    self.right = rect.left
+                elif vel.x < 0:
+                    collided |= Side.LEFT
+                    self.left = rect.right
+                vel.x = 0
+                pos.x = self.centerx
+                left, right = self.left, self.right
+        return collided
 
-        for body in collision_list:
-            if self.colliderect(body.body):
-                if self.owner.vel.y > 0:
-                    collided[1] = True
+    def resolve_y(self, rects: Iterable[pygame.Rect]) -> int:
+        pos, vel = self.owner.pos, self.owner.vel
+        self.centery = pos.y
+        collided = 0
+
+        left, right, top, bottom = self.left, self.right, self.top, self.bottom
+        for rect in rects:
+            if rect.left < right and left < rect.right and rect.top < bottom and top < rect.bottom:
+                if vel.y > 0:
+                    collided |= Side.BOTTOM
                     self.ground_counter = 5
-                    self.bottom = body.body.top
-                elif self.owner.vel.y < 0:
-                    collided[0] = True
-                    self.top = body.body.bottom
-                self.owner.vel.y = 0
-                self.owner.pos.y = self.centery
+                    self.bottom = rect.top
+                elif vel.y < 0:
+                    collided |= Side.TOP
+                    self.top = rect.bottom
+                vel.y = 0
+                pos.y = self.centery
+                top, bottom = self.top, self.bottom
         return collided
 
 
 class StaticBody:
 
+    __slots__ = ("pos", "body")
+
     def __init__(self, dim, pos):
         self.pos = Vector(pos)
         self.body = CollisionRect(self, dim, pos)
 
     def resize(self, dim):
-        self.body = CollisionRect(self, dim)
+        self.body.size = dim
         self.body.center = self.pos
 
 
 class KinematicBody(StaticBody):
 
+    __slots__ = ("vel", "acc", "ground_counter", "collided")
+
     def __init__(self, dim, pos, vel=(0, 0)):
         super().__init__(dim, pos)
         self.vel = Vector(vel)
         self.acc = Vector(0, 0)
         self.ground_counter = 0
-        self.collided = [False, False, False, False]
+        self.collided = 0
 
     def move(self, dt: float, collision_list: tuple = None):
+        pos, vel, body = self.pos, self.vel, self.body
+        dx, dy = vel.x * dt, vel.y * dt
+        body.center = pos                                        # pos may have been changed from outside
+        collided = 0
 
-        self.pos.x += self.vel.x * dt                            # x = ∫vx dt
-        self.collided[:2] = self.body.collide_x(collision_list)  # solving collisions in the x direction
+        if collision_list is not None and (dx or dy):            # one candidate query covering the whole step
+            if not isinstance(collision_list, CollisionList):
+                collision_list = CollisionList(collision_list)
+            candidates = collision_list.hits(body.inflate(2 * int(abs(dx)) + 2, 2 * int(abs(dy)) + 2))
+        else:
+            candidates = ()
 
-        self.pos.y += self.vel.y * dt                            # y = ∫vy dt
-        self.collided[2:] = self.body.collide_y(collision_list)  # solving collisions in the y direction
+        if dx:
+            pos.x += dx                                          # x = ∫vx dt
+            collided = body.resolve_x(candidates)                # solving collisions in the x direction
+
+        if dy:
+            pos.y += dy                                          # y = ∫vy dt
+            collided |= body.resolve_y(candidates)
+
+        self.collided = collided
 
 
 class DynamicBody(KinematicBody):
 
+    __slots__ = ("mass", "g", "friction", "test")
+
     def __init__(
             self,
             dim: CoordinateArrayType,
@@ -110,13 +181,52 @@ class DynamicBody(KinematicBody):
 
     def move(self, dt: float, collision_list: tuple = None):
 
-        self.acc = self.net_force() / self.mass                  # a = F / m
-        self.collided = [False, False, False, False]
-
-        self.vel.x += self.acc.x * dt                            # vx = ∫ax dt
-        self.pos.x = self.pos.x + self.vel.x * dt                # x = ∫vx dt
-        self.collided[:2] = self.body.collide_x(collision_list)  # solving collisions in the x direction
-
-        self.vel.y += self.acc.y * dt                            # vy = ∫ay dt
-        self.pos.y = self.pos.y + self.vel.y * dt                # y = ∫vy dt
-        self.collided[2:] = self.body.collide_y(collision_list)  # solving collisions in the y direction
+        vel, acc, friction, test = self.vel, self.acc, self.friction, self.test
+        fx, fy = test.x, test.y
+        if friction:                                             # F = test - friction * v
+            fx -= vel.x * friction
+            fy -= vel.y * friction
+
+        if fx or fy:                                             # a = F / m + g
+            mass = self.mass
+            acc.x, acc.y = fx / mass, fy / mass + self.g
+        else:
+            acc.x, acc.y = 0.0, self.g
+
+        vel.x += acc.x * dt                                      # vx = ∫ax dt
+        vel.y += acc.y * dt                                      # vy = ∫ay dt
+        super().move(dt, collision_list)
+
+
+class BodyGroup:
+
+    def __init__(self, bodies: Iterable[KinematicBody] = ()):
+        self._bodies = list(bodies)
+        self._moves = [body.move for body in self._bodies]
+
+    def __iter__(self):
+        return iter(self._bodies)
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def add(self, body: KinematicBody):
+        self._bodies.append(body)
+        self._moves.append(body.move)
+
+    def remove(self, body: KinematicBody):
+        index = self._bodies.index(body)
+        del self._bodies[index]
+        del self._moves[index]
+
+    def move(self, dt: float, collision_list=None):
+        if hasattr(collision_list, "overlaps"):
+            collision_list.update(dt)
+            overlaps = collision_list.overlaps
+            for body, move in zip(self._bodies, self._moves):
+                move(dt, overlaps(body))
+        else:
+            if collision_list is not None and not isinstance(collision_list, CollisionList):
+                collision_list = CollisionList(collision_list)
+            for move in self._moves:
+                move(dt, collision_list)
@@ -7,6 +7,10 @@ from engine.tools import Singleton
 
 class Timer:
 
+    __slots__ = (
+        "clock", "_period", "_modifier", "_threshold", "periodic", "state_mark", "running", "signal", "method", "_index",
+    )
+
     def __init__(
             self, clock, period: int,
             initial_value: bool = False,
@@ -15,26 +19,45 @@ class Timer:
             method: Callable = None,
     ):
 
-        clock.timers.add(self)
+        self._index = len(clock.timers)
+        clock.timers.append(self)
         self.clock = clock
+        self._modifier = 1
         self.period = period
         self.periodic = periodic
 
         self.state_mark = self.clock.now - int(not running) * self.period
-        self.modifier = 1
 
         self.running = running
         self.signal = [initial_value, False]
 
         self.method = method
 
+    @property
+    def period(self) -> int:
+        return self._period
+
+    @period.setter
+    def period(self, value: int):
+        self._period = value
+        self._threshold = value * self._modifier
+
+    @property
+    def modifier(self) -> float:
+        return self._modifier
+
+    @modifier.setter
+    def modifier(self, value: float):
+        self._modifier = value
+        self._threshold = self._period * value
+
     @property
     def progress(self) -> float:  # (0; 1]
         return self.raw_progress if self.running else 1
 
     @property
     def raw_progress(self) -> float:
-        return (self.clock.now - self.state_mark) / (self.period * self.modifier)
+        return (self.clock.now - self.state_mark) / self._threshold
 
     def force(self):
         self.running = True
@@ -49,14 +72,15 @@ class Timer:
     def delay(self, period: int):
         self.state_mark = self.clock.now + period
 
-    def update(self):
-        self.signal[1] = self.signal[0]
+    def update(self, now: float):
+        signal = self.signal
+        signal[1] = signal[0]
         if self.running:
-            self.signal[0] = False
-            if self.clock.now - self.state_mark >= self.period * self.modifier:
-                self.signal[0] = True
+            signal[0] = False
+            if now - self.state_mark >= self._threshold:
+                signal[0] = True
                 self.running = self.periodic
-                self.state_mark = self.clock.now
+                self.state_mark = now
                 if self.method is not None:
                     self.method()
                     if not self.periodic:
@@ -79,8 +103,13 @@ class Timer:
             self.reset()
 
     def delete(self):
-        if self in self.clock.timers:
-            self.clock.timers.remove(self)
+        if self._index is not None:     # swap the last timer into this slot
+            timers, index = self.clock.timers, self._index
+            last = timers.pop()
+            if last is not self:
+                timers[index] = last
+                last._index = index
+            self._index = None
         del self
 
 
@@ -88,19 +117,26 @@ class Clock(metaclass=Singleton):
 
     def __init__(self):
         self.clock = pygame.time.Clock()
-        self.timers = set()
+        self.timers = []
         self.now = 0.0
         self.dt = 0.0
+        self.inv_dt = 0.0
+
+    @property
+    def fps(self) -> float:
+        return self.inv_dt
 
     def timer(self, *args, **kwargs) -> Timer:
         return Timer(self, *args, **kwargs)
 
     def update(self):
-        self.now = pygame.time.get_ticks()
-        for timer in self.timers:
-            timer.update()
+        now = self.now = pygame.time.get_ticks()
+        for timer in tuple(self.timers):  # callbacks may delete timers
+            if timer._index is not None:
+                timer.update(now)
 
     def tick(self, fps) -> float:
         self.update()
         self.dt = self.clock.tick(fps) / 1000.0
+        self.inv_dt = 1.0 / self.dt if self.dt > 0 else 0.0
         return self.dt
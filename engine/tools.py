@@ -1,15 +1,40 @@
 
 from abc import ABCMeta
-from ctypes import windll
+from ctypes import c_void_p
+from itertools import accumulate, count
+from os import environ
+from typing import Callable, Iterable
 
+import pygame
 from pygame.math import Vector2 as Vector
 
+try:
+    from ctypes import windll
+except ImportError:
+    windll = None
+
+# SDL reads this hint once, when the video subsystem starts. It has to be set
+# before the first display init anywhere in the process, including the one below.
+environ.setdefault("SDL_VIDEO_DOUBLE_BUFFER", "1")
+
+
+def _screen_size() -> tuple:
+    if windll is None:
+        pygame.display.init()
+        info = pygame.display.Info()
+        return info.current_w, info.current_h
+
+    # resolution fix
+    user32 = windll.user32
+    try:
+        user32.SetProcessDpiAwarenessContext(c_void_p(-4))  # per monitor aware v2
+    except AttributeError:
+        user32.SetProcessDPIAware()
+    return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+
 
 class Window:
-    # resolution fix ---------------------------------------------------------------------
-    windll.user32.SetProcessDPIAware()
-    WIDTH, HEIGHT = (windll.user32.GetSystemMetrics(0), windll.user32.GetSystemMetrics(1))
-    # ------------------------------------------------------------------------------------
+    WIDTH, HEIGHT = _screen_size()
 
 
 class Direction:
@@ -30,6 +55,9 @@ class Align:
     MR: str = "midright"
     C: str = "center"
 
+    GETTERS = {name: getattr(pygame.Rect, name).__get__ for name in (TL, TR, BL, BR, MT, MB, ML, MR, C)}
+    SETTERS = {name: getattr(pygame.Rect, name).__set__ for name in (TL, TR, BL, BR, MT, MB, ML, MR, C)}
+
 
 class Singleton(ABCMeta):
     """
@@ -37,38 +65,56 @@ class Singleton(ABCMeta):
     If an instance already exists upon class call, it returns that instance instead of creating a new one.
     """
 
-    _INSTANCES = {}
+    _instance = None
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._INSTANCES:
-            cls._INSTANCES[cls] = super().__call__(*args, **kwargs)
-        return cls._INSTANCES[cls]
+        instance = cls._instance
+        if instance.__class__ is not cls:
+            instance = super().__call__(*args, **kwargs)
+            cls._instance = instance
+        return instance
 
 
 class Hashable:
-    _id = 0
+    __slots__ = ()
+    _IDS = count(1)
 
     def __init__(self):
         self.id = self.unique_id()
 
     def __hash__(self) -> int:
-        return hash(self.id)
+        return self.id
 
     def __eq__(self, other: "Hashable") -> bool:
         return self.id == other.id
 
     @classmethod
-    def unique_id(cls) -> str:
-        cls._id += 1
-        return f"{cls.__name__}_{cls._id}"
+    def unique_id(cls) -> int:
+        return next(Hashable._IDS)
 
 
 class Filter:
 
+    __slots__ = ("_a", "_b", "_state")
+
     def __init__(self, coefficient: float, initial_value: float = 0.0):
-        self._coefficient = min(max(coefficient, 0), 1)
+        self._b = 0.0 if coefficient < 0 else 1.0 if coefficient > 1 else float(coefficient)
+        self._a = 1 - self._b
         self._state = initial_value
 
     def __call__(self, value: float) -> float:
-        self._state = self._state * (1 - self._coefficient) + value * self._coefficient
+        self._state = self._state * self._a + value * self._b
         return self._state
+
+    def compile(self) -> Callable[[float], float]:
+        state, a, b = [self._state], self._a, self._b
+
+        def step(value: float) -> float:
+            state[0] = state[0] * a + value * b
+            return state[0]
+
+        return step
+
+    def apply(self, values: Iterable[float]) -> list:
+        a, b = self._a, self._b
+        return list(accumulate(values, lambda state, value: state * a + value * b, initial=self._state))[1:]
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 
 import pygame
@@ -11,15 +12,24 @@ from engine.tools import Align, Filter
 from game.settings import COLORS, LAYOUT, KEYS, SETTINGS, PATH
 
 
+@lru_cache(maxsize=64)
+def _debug_surface(text: str, color: tuple) -> pygame.Surface:
+    return Gui.FONT[False][20].render(text, False, color)
+
+
 class Framework(Engine):
 
     def __init__(self):
-        super().__init__(SETTINGS.FPS, SETTINGS.SCALE, pygame.FULLSCREEN | pygame.SCALED)
+        super().__init__(SETTINGS.FPS, SETTINGS.SCALE, pygame.FULLSCREEN | pygame.SCALED | pygame.DOUBLEBUF)
 
         self.event_handler = EventHandler(self.clock, KEYS)
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(EventHandler.QUEUED_TYPES)
 
         self.fps = 0
-        self.fps_filter = Filter(SETTINGS.FPS_FILTER, SETTINGS.FPS)
+        self._background = COLORS.BACKGROUND
+        self._debug_color = tuple(COLORS.GREY7)
+        self.fps_filter = Filter(SETTINGS.FPS_FILTER, SETTINGS.FPS).compile()
 
         self.gui: Gui = Gui(text_size=16)
 
@@ -32,6 +42,7 @@ class Framework(Engine):
 
         self.test_timer = Timer(self.clock, 150, periodic=True)
         # self.test_sprite_sheet = SpriteSheet(PATH.TEST_SPRITE, scale=1)
+        # self.test_sprite_sheet.rebind_to_display()
         # self.test_scene = Scene(self.test_sprite_sheet, ("machinegun_run_1", "machinegun_run_2"))
 
         self.init_gui()
@@ -50,7 +61,7 @@ class Framework(Engine):
         self.test_input = NumericInput(main_group, LAYOUT.TEST_INPUT, COLORS.RED_INPUT, register="test", **settings)
 
     def events(self):
-        self.event_handler.update()
+        self.event_handler.update(pygame.event.get() if self.pumping else [])
 
         if self.event_handler["EXIT", "press"] or self.event_handler["exit"] or self.exit_button.pressed:
             self.exit()
@@ -58,19 +69,37 @@ class Framework(Engine):
         self.gui.events(self.event_handler)
 
     def logic(self):
-        # self.fps_label.value = self.fps_filter(1 / self.clock.dt)
+        self.fps = self.fps_filter(self.clock.fps or self._fps)
+        if int(self.fps) != self.fps_label.value:
+            self.fps_label.value = int(self.fps)
         # if self.test_timer.query():
         #     self.test_scene.next()
-        pass
 
     def render(self):
-        self.display.fill(COLORS.BACKGROUND)
-        self.gui.render(self.display)
-        # self.display.blit(self.test_scene.frame(False), (100, 100))
-        pygame.display.flip()
+        display, gui = self.display, self.gui
+        pending = None if self.draws_world() else gui.pending()
+        if pending is None:
+            display.fill(self._background)
+            gui.render(display)
+            self.draw_world(display)
+            pygame.display.flip()
+        elif pending:
+            clip = pending[0].unionall(pending[1:])
+            display.set_clip(clip)
+            display.fill(self._background)
+            dirty = gui.render(display)
+            display.set_clip(None)
+            pygame.display.update(dirty)
+            if not all(map(clip.contains, dirty)):
+                gui.invalidate_order()
+
+    def draws_world(self) -> bool:
+        return False
+
+    def draw_world(self, display: pygame.Surface):
+        # display.blit(self.test_scene.frame(False), (100, 100))
+        pass
 
     def debug_text(self, data=""):
-        surface = Gui.FONT[False][20].render(str(data), False, COLORS.GREY7)
-        rect = surface.get_rect()
-        rect.topleft = (5, 5)
-        self.display.blit(surface, rect)
+        text = f"{data:.1f}" if isinstance(data, float) else str(data)
+        self.display.blit(_debug_surface(text, self._debug_color), (5, 5))
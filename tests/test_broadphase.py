@@ -0,0 +1,32 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from engine.broadphase import SweepAndPrune
+from engine.physics import BodyGroup, KinematicBody, Side
+
+
+def test_approaching_bodies_collide():
+    mover = KinematicBody((10, 10), (0, 0), (100, 0))
+    wall = KinematicBody((10, 10), (30, 0))
+    group, broadphase = BodyGroup([mover, wall]), SweepAndPrune([mover, wall])
+
+    collided = 0
+    for _ in range(10):
+        group.move(0.1, broadphase)
+        collided |= mover.collided
+
+    assert mover.body.right == wall.body.left
+    assert collided & Side.RIGHT
+    assert mover.vel.x == 0
+
+
+def test_fast_body_is_caught_before_it_overlaps():
+    mover = KinematicBody((10, 10), (0, 0), (250, 0))
+    wall = KinematicBody((10, 10), (30, 0))
+    group, broadphase = BodyGroup([mover, wall]), SweepAndPrune([mover, wall])
+
+    group.move(0.1, broadphase)
+
+    assert mover.body.right == wall.body.left
+    assert mover.collided & Side.RIGHT
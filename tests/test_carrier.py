@@ -0,0 +1,65 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from engine.gui import Gui, FloatingWindow, HorizontalSlider, WidgetGroup
+
+
+WINDOW_COLOR = ((30, 30, 30), ((60, 60, 60), (90, 90, 90)), (200, 200, 200), ((150, 0, 0), (200, 0, 0)))
+SLIDER_COLOR = (((255, 0, 0), (0, 0, 255)), ((255, 0, 0), (0, 0, 255)))
+
+
+@pytest.fixture
+def display():
+    pygame.init()
+    Gui._instance = None  # Gui is a singleton, every test starts from a fresh one
+    yield pygame.display.set_mode((600, 400))
+    Gui._instance = None
+    pygame.quit()
+
+
+def test_slider_inside_carrier_is_drawn(display):
+    gui = Gui(text_size=16)
+    window = FloatingWindow(gui, (100, 100, 300, 200), WINDOW_COLOR, "Window", active=True)
+    slider = HorizontalSlider(window, (20, 50), SLIDER_COLOR, 200)
+
+    display.fill((0, 0, 0))
+    gui.render(display)
+
+    assert display.get_at(slider._slider.center)[:3] == (255, 0, 0)
+    assert display.get_at((slider._rail.right - 5, slider._rail.centery))[:3] == (0, 0, 255)
+
+
+def test_dragged_window_carries_slider(display):
+    gui = Gui(text_size=16)
+    window = FloatingWindow(gui, (100, 100, 300, 200), WINDOW_COLOR, "Window", active=True)
+    slider = HorizontalSlider(window, (20, 50), SLIDER_COLOR, 200)
+    offset = slider._rail.left - slider.left, slider._rail.top - slider.top
+
+    left, top = window.topleft
+    window.float(pygame.Vector2(-40, -30))
+    assert window.topleft != (left, top)
+    assert (slider._rail.left - slider.left, slider._rail.top - slider.top) == offset
+    assert slider._slider.topleft == slider.topleft
+
+    display.fill((0, 0, 0))
+    gui.render(display)
+    assert display.get_at(slider._slider.center)[:3] == (255, 0, 0)
+
+
+def test_group_reports_pending_areas_of_a_nested_carrier(display):
+    gui = Gui(text_size=16)
+    group = WidgetGroup(gui)
+    window = FloatingWindow(gui, (100, 100, 300, 200), WINDOW_COLOR, "Window", active=True)
+    slider = HorizontalSlider(window, (20, 50), SLIDER_COLOR, 200)
+    group.add_widget(window)
+
+    display.fill((0, 0, 0))
+    gui.render(display)
+    assert group.pending() == []
+
+    slider.hovered = not slider.hovered
+    assert any(area.contains(slider._slider) for area in group.pending())